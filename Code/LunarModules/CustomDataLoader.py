@@ -48,7 +48,13 @@ class CustomDataLoader:
         self.first_n = first_n
         self.log_file = log_file
 
-        self.element_counter = 0 
+        self.element_counter = 0
+
+        # Built once here (instead of per __getitem__) so preprocessing state
+        # is reused; holds no file handles so the Dataset pickles cleanly
+        # into DataLoader worker processes
+        self.img_mask_processor = ImageProcessor()
+        self.check_plotter = Plotter()
 
         self.images_list = os.listdir(self.img_folder) #List of training images
         self.masks_list = os.listdir(self.mask_folder) #List of Mask images
@@ -102,8 +108,8 @@ class CustomDataLoader:
         # print('Mask CV2 Max/Min Val: ', np.max(test_mask), np.min(test_mask))
         # print(test.shape, test_mask.shape)
 
-        img_mask_processor = ImageProcessor()
-        check_plotter = Plotter()
+        img_mask_processor = self.img_mask_processor
+        check_plotter = self.check_plotter
 
         #Data Augmentation steps
         if self.augmentation:
@@ -111,9 +117,9 @@ class CustomDataLoader:
 
         #check_plotter.peek_images(sample_images=img_loaded,sample_masks=mask_loaded,file_name=f'current_test_2.png')
 
-        #Pre-processing steps
-        img_loaded = img_mask_processor.preprocessor_images(img_loaded)
-        mask_loaded = img_mask_processor.preprocessor_masks(mask_loaded)
+        #Pre-processing steps, returning CHW float32 tensors directly
+        img_tensor = img_mask_processor.preprocessor_images(img_loaded, return_tensor=True)
+        mask_tensor = img_mask_processor.preprocessor_masks(mask_loaded, return_tensor=True)
 
         # Check and save images as plots
         # sample_mask = img_mask_processor.rescale(mask_loaded)
@@ -123,13 +129,6 @@ class CustomDataLoader:
         # sample_mask_decoded = img_mask_processor.rescale(sample_mask_decoded)
         # check_plotter.peek_images(sample_images=img_loaded,sample_masks=sample_mask_decoded,file_name='current_test.png')
 
-        img_tensor = torch.from_numpy(img_loaded).float()
-        mask_tensor = torch.from_numpy(mask_loaded).float()
-
-        # Change ordering, channels first then img size
-        img_tensor = img_tensor.permute(2, 0, 1)
-        mask_tensor = mask_tensor.permute(2, 0, 1)
-
         plt.close('all')
         # returns as a tuple of tensors
         return img_tensor, mask_tensor
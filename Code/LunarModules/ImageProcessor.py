@@ -12,12 +12,20 @@ import seaborn as sns
 import os
 import random
 import cv2
-import copy
 import torchvision.transforms as T
 import torchvision.transforms.functional as TF
 import torch
 from PIL import Image
 from matplotlib import cm
+from LunarModules import _kernels
+
+try:
+    from LunarModules import _ohe_simd
+    OHE_SIMD_AVAILABLE = True
+except ImportError:
+    # Optional AVX2 extension, see setup_ohe_simd.py
+    _ohe_simd = None
+    OHE_SIMD_AVAILABLE = False
 
 
 class ImageProcessor:
@@ -31,7 +39,24 @@ class ImageProcessor:
             log_file (str): default is None to not have logging, otherwise, specify logging path ../filepath/log.log
 
         '''
-    def binarize(self, img, threshold=128):
+        # Default class palette, cached once so the encode/decode paths never
+        # rebuild the class_map DataFrame or iterate its rows per image
+        self._class_names = ['Sky', 'Big Rocks', 'Small Rocks', 'Unlabeled']
+        self._default_colors = np.array([[255, 0, 0], [0, 0, 255], [0, 255, 0], [0, 0, 0]], dtype=np.uint8)
+        self._default_colors_f32 = self._default_colors.astype(np.float32)
+
+        # Scratch buffer reused by binarize when the caller does not pass out=
+        self._bin_buf = None
+
+        # ColorJitter resamples its parameters on every call, so one shared
+        # instance is safe and skips per-sample transform construction
+        self._color_jitter = T.ColorJitter(brightness=0.5, contrast=0.5, saturation=0.5, hue=0.5)
+
+        # torch.compile specializations of the tensor mask encode, keyed by
+        # (shape, dtype, device) since training runs at one fixed resolution
+        self._mask_encode_compiled = {}
+
+    def binarize(self, img, threshold=128, out=None):
         """
         Function to binarize images at some threshold pixel value.
         Set to 0 or 255.
@@ -39,31 +64,86 @@ class ImageProcessor:
         Parameters:
         img: image in numpy matrix
         threshold: pixel threshold to binarize
+        out: optional preallocated float32 output buffer of the same shape.
+            When omitted, a per-shape scratch buffer cached on the instance
+            is reused, so copy the result if it must outlive the next call.
 
         Return:
-        img: binarized image in numpy matrix
+        out: binarized image in numpy matrix; the input is never mutated
         """
-        # Binarize the image
-        if np.max(img) > 1:
-            img[img > threshold] = 255.
-            img[img <= threshold] = 0.
+        # Pick the threshold scale from the dtype (0-255 for ints, 0-1 for floats)
+        # instead of scanning the whole image with np.max
+        if np.issubdtype(img.dtype, np.integer):
+            thr = threshold
         else:
-            img[img > (threshold/255.)] = 255.
-            img[img <= (threshold/255.)] = 0.    
+            thr = threshold/255.
 
-        return img
-    
-    def rescale(self, img):
+        if out is None:
+            if self._bin_buf is None or self._bin_buf.shape != img.shape:
+                self._bin_buf = np.empty(img.shape, dtype=np.float32)
+            out = self._bin_buf
+
+        # Binarize the image in a single fused pass
+        if _kernels.NUMBA_AVAILABLE and img.ndim == 3:
+            _kernels.binarize_kernel(np.ascontiguousarray(img), thr, out)
+            return out
+
+        np.multiply(np.greater(img, thr), np.float32(255.), out=out)
+        return out
+
+    def binarize_t(self, img, threshold=128):
         """
-        Function to rescale image from 0 to 255 to between 0 and 1. 
-        
+        Tensor version of binarize for torch.Tensor inputs, running on
+        whatever device (CPU or CUDA) the tensor already lives on.
+
+        Parameters:
+        img: image as a torch.Tensor
+        threshold: pixel threshold to binarize
+
+        Return:
+        binarized float tensor of 0s and 255s on the same device
+        """
+        if img.is_floating_point():
+            thr = threshold/255.
+        else:
+            thr = threshold
+
+        return (img > thr).float().mul_(255.)
+
+    def rescale_t(self, img):
+        """
+        Tensor version of rescale for torch.Tensor inputs with 0-255
+        values, running on the tensor's device.
+
+        Parameters:
+        img: image as a torch.Tensor with 0-255 values
+
+        Return:
+        rescaled float tensor with 0-1 values on the same device
+        """
+        return torch.mul(img, 1./255)
+
+    def rescale(self, img, out=None):
+        """
+        Function to rescale image from 0 to 255 to between 0 and 1.
+
         Parameters:
             img: image in numpy matrix
+            out: optional preallocated float32 output buffer of the same shape
+                to avoid the allocation; ignored when the image is already 0-1
 
         Return:
             img: rescaled image in numpy matrix
         """
         if np.max(img) > 1:
+            if _kernels.NUMBA_AVAILABLE and img.ndim == 3:
+                if out is None:
+                    out = np.empty(img.shape, dtype=np.float32)
+                _kernels.rescale_kernel(np.ascontiguousarray(img), out)
+                return out
+            if out is not None:
+                np.multiply(img, 1./255, out=out)
+                return out
             img = np.multiply(img, 1./255)
 
         return img
@@ -80,49 +160,58 @@ class ImageProcessor:
         Return:
             normalized_mask: normalized mask image
         """
-        max_R_value = img[::,::,0].max()
-        max_G_value = img[::,::,1].max()
-        max_B_value = img[::,::,2].max()
-
-        normalized_R_channel = copy.deepcopy(img[::,::,0])
-        normalized_G_channel = copy.deepcopy(img[::,::,1])
-        normalized_B_channel = copy.deepcopy(img[::,::,2])
+        if _kernels.NUMBA_AVAILABLE and img.ndim == 3:
+            out = np.empty_like(img)
+            _kernels.mask_max_pixel_normalize_kernel(np.ascontiguousarray(img), threshold, out)
+            return out
 
-        normalized_R_channel[normalized_R_channel > (max_R_value*threshold)] = 1.
-        normalized_G_channel[normalized_G_channel > (max_G_value*threshold)] = 1.
-        normalized_B_channel[normalized_B_channel > (max_B_value*threshold)] = 1.
-
-        normalized_mask = np.dstack((normalized_R_channel,normalized_G_channel,normalized_B_channel))
+        # Per-channel max in one reduction pass, then one fused pass to set
+        # pixels above max*threshold to 1 and leave the rest untouched
+        max_channel_values = img.reshape(-1, img.shape[2]).max(axis=0)
+        normalized_mask = np.where(img > (max_channel_values*threshold), img.dtype.type(1.), img)
 
         return normalized_mask
 
-    def mask_argmax(self, predicted_mask):
+    def mask_argmax(self, predicted_mask, channels_first=False):
         """
-        Function to argmax across the third dimension and set the pixel of the highest channel to 1
+        Function to argmax across the class dimension and set the pixel of the highest channel to 1
         and everything else to 0
 
         Parameters:
-            predicted_mask: predicted mask
+            predicted_mask: predicted mask, (H, W, num classes) or
+                            (num classes, H, W) when channels_first is True
+            channels_first: set True for (num classes, H, W) input/output
 
         Return:
-            predicted_mask_argmax: 
+            predicted_mask_argmax: one hot mask in the same layout as the input
         """
-        idx = predicted_mask.argmax(axis=2)
-        predicted_mask_argmax = np.zeros_like(predicted_mask)
+        # Fancy-index an identity matrix with the argmax to build the one hot mask in one pass
+        if channels_first:
+            num_classes = predicted_mask.shape[0]
+            predicted_mask_argmax = np.eye(num_classes, dtype=predicted_mask.dtype)[predicted_mask.argmax(axis=0)]
+            return np.ascontiguousarray(np.moveaxis(predicted_mask_argmax, -1, 0))
 
-        class1 = predicted_mask_argmax[::,::,0]
-        class2 = predicted_mask_argmax[::,::,1]
-        class3 = predicted_mask_argmax[::,::,2]
-        class4 = predicted_mask_argmax[::,::,3]
+        num_classes = predicted_mask.shape[2]
+        predicted_mask_argmax = np.eye(num_classes, dtype=predicted_mask.dtype)[predicted_mask.argmax(axis=2)]
 
-        class1[np.where(idx==0)] = 1
-        class2[np.where(idx==1)] = 1
-        class3[np.where(idx==2)] = 1
-        class4[np.where(idx==3)] = 1
+        return predicted_mask_argmax
 
-        predicted_mask_argmax = np.dstack((class1,class2,class3,class4))
+    def mask_argmax_t(self, predicted_mask):
+        """
+        Tensor version of mask_argmax for channels-first torch.Tensor
+        inputs, (num classes, H, W) or batched (N, num classes, H, W),
+        running on the tensor's device.
 
-        return predicted_mask_argmax
+        Parameters:
+            predicted_mask: predicted mask as a torch.Tensor
+
+        Return:
+            one hot tensor of the argmax class, same shape and device
+        """
+        num_classes = predicted_mask.shape[-3]
+        one_hot = torch.nn.functional.one_hot(predicted_mask.argmax(dim=-3), num_classes)
+
+        return one_hot.movedim(-1, -3).to(predicted_mask.dtype)
 
     def one_hot_encode(self, img, class_map=None):
         """
@@ -133,98 +222,82 @@ class ImageProcessor:
             class_map: class_df
 
         Return:
-            frame: one hot encoded image where each channel represents a class
+            frame: one hot encoded image, channels first (num classes, H, W),
+                    each channel represents a class
         """
 
+        # Cached palette for the default classes; a custom class_map is
+        # converted to an array once up front, never iterated per row
         if class_map is None:
-            class_map = pd.DataFrame({'name':['Sky', 'Big Rocks', 'Small Rocks', 'Unlabeled'], 
-                                    'r':[255,0,0,0], 
-                                    'g':[0,0,255,0],
-                                    'b':[0,255,0,0]})
-
-        img_copy = copy.deepcopy(img)
-        frame = np.zeros((img.shape[0], img.shape[1], len(class_map))).astype('int')
-
-        class_channel = 0
-
-        for index, row in class_map.iterrows():
-            new_img = copy.deepcopy(img_copy[::,::,::])
-
-            R = new_img[::,::,0]
-            G = new_img[::,::,1]
-            B = new_img[::,::,2]
-
-            # OHE each class type
-            new_img[(R == row['r']/255) & (G == row['g']/255) & (B == row['b']/255)] = 2
-            new_img[new_img < 2] = 0
-            new_img[new_img == 2] = 1
-
-            new_channel = copy.deepcopy(new_img[::,::,0])
-
-            # Take first layer since they are all the same and put into OHE mask
-            frame[::,::,class_channel] = new_channel
-
-            class_channel+=1
+            palette = self._default_colors
+        else:
+            palette = class_map[['r', 'g', 'b']].values.astype(np.uint8)
+
+        # Quantize float masks to uint8 once (exact for k/255 pixel values)
+        # so every path below compares integer codes
+        if img.dtype != np.uint8:
+            img = np.rint(np.multiply(img, 255.)).astype(np.uint8)
+
+        if _kernels.NUMBA_AVAILABLE and not OHE_SIMD_AVAILABLE and img.ndim == 3:
+            frame = np.empty((len(palette), img.shape[0], img.shape[1]), dtype=np.uint8)
+            _kernels.one_hot_encode_kernel(np.ascontiguousarray(img), palette, frame)
+            return frame
+
+        # Pack each pixel's RGB into a single uint32 code so every class takes
+        # one compare per pixel instead of three compares and two ANDs
+        packed = ((img[..., 0].astype(np.uint32) << 16)
+                  | (img[..., 1].astype(np.uint32) << 8)
+                  | img[..., 2].astype(np.uint32))
+        codes = ((palette[:, 0].astype(np.uint32) << 16)
+                 | (palette[:, 1].astype(np.uint32) << 8)
+                 | palette[:, 2].astype(np.uint32))
+
+        # AVX2 extension compares 8 packed pixels per instruction
+        if OHE_SIMD_AVAILABLE and img.ndim == 3:
+            frame = np.empty((len(codes), img.shape[0], img.shape[1]), dtype=np.uint8)
+            _ohe_simd.ohe_packed_u32(np.ascontiguousarray(packed), codes, frame)
+            return frame
+
+        # One broadcast compare straight into the channel-major layout
+        frame = (packed[..., None, :, :] == codes[:, None, None]).astype(np.uint8)
 
         return frame
 
-    def reverse_one_hot_encode(self, img, class_map=None):
+    def reverse_one_hot_encode(self, img, class_map=None, channels_first=False):
         """
         Function to reverse one hot encode 4 class channel to 3 channel RGB mask
 
         Parameters:
-            img: image of one hot encoded mask image where each channel represents a class
+            img: image of one hot encoded mask image where each channel represents a class,
+                    (H, W, num classes) or (num classes, H, W) when channels_first is True
             class_map: class_df
+            channels_first: set True for (num classes, H, W) input
 
         Return:
-            rgb_img: reversed one hot encoded image of RGB channels
+            rgb_img: reversed one hot encoded image of RGB channels (H, W, 3)
         """
 
+        # Palette of class colors, shape (num classes, 3), cached for the
+        # default classes
         if class_map is None:
-            class_map = pd.DataFrame({'name':['Sky', 'Big Rocks', 'Small Rocks', 'Unlabeled'], 
-                                    'r':[255.,0.,0.,0.], 
-                                    'g':[0.,0.,255.,0.],
-                                    'b':[0.,255.,0.,0.]})
-            
-        img = self.binarize(img)
-
-        all_red_channels = []
-        all_green_channels = []
-        all_blue_channels = []
-
-        class_channel = 0
-
-        for index, row in class_map.iterrows():
-
-            current_class_channel = copy.deepcopy(img[::,::,class_channel])
-
-            temp_rgb = np.zeros((img.shape[0], img.shape[1], 3))
-
-            # if pixel value > 128 then put 0s in R, 255 in g, 255 in b
-            # or corresponding RGB for each class
-
-            if row['r'] > 0:
-                temp_rgb[::,::,0] = current_class_channel
-            if row['g'] > 0:
-                temp_rgb[::,::,1] = current_class_channel
-            if row['b'] > 0:
-                temp_rgb[::,::,2] = current_class_channel
-
-            all_red_channels.append(copy.deepcopy(temp_rgb[::,::,0]))
-            all_green_channels.append(copy.deepcopy(temp_rgb[::,::,1]))
-            all_blue_channels.append(copy.deepcopy(temp_rgb[::,::,2]))
-
-            class_channel += 1
+            colors = self._default_colors_f32
+        else:
+            colors = class_map[['r', 'g', 'b']].values.astype(np.float32)
 
-        red_stack = np.dstack(tuple(all_red_channels))
-        green_stack = np.dstack(tuple(all_green_channels))
-        blue_stack = np.dstack(tuple(all_blue_channels))
+        if channels_first:
+            img = np.moveaxis(img, 0, -1)
 
-        rgb_img = np.zeros((img.shape[0], img.shape[1], 3))
+        # one_hot_encode emits uint8 0/1 planes; binarize picks its threshold
+        # from the dtype (128 for ints) and would zero those out, so pass
+        # already-binary integer input straight through
+        if np.issubdtype(img.dtype, np.integer) and img.max() <= 1:
+            img_bin = img.astype(np.float32)
+        else:
+            img_bin = self.binarize(img)/255.
 
-        rgb_img[::,::,0] = np.max(red_stack, axis=2)
-        rgb_img[::,::,1] = np.max(green_stack, axis=2)
-        rgb_img[::,::,2] = np.max(blue_stack, axis=2)
+        # Contract the class axis against the palette: (H, W, C) x (C, 3) -> (H, W, 3)
+        rgb_img = np.tensordot(img_bin, colors, axes=([2], [0]))
+        np.minimum(rgb_img, 255., out=rgb_img)
 
         return rgb_img
 
@@ -245,33 +318,43 @@ class ImageProcessor:
         Both Image and Mask:
             - Random horizontal and vertical flips
         '''
-        pil_image = Image.fromarray((image * 255).astype(np.uint8))
-        pil_mask = Image.fromarray((mask * 255).astype(np.uint8))
+        # Fused uint8 -> float32 rescale in one pass, no float64 intermediate;
+        # float inputs from plt.imread are already 0-1 and wrap zero-copy
+        if image.dtype == np.uint8:
+            image = np.multiply(image, np.float32(1.0/255.0), dtype=np.float32)
+        if mask.dtype == np.uint8:
+            mask = np.multiply(mask, np.float32(1.0/255.0), dtype=np.float32)
+
+        # Work on CHW tensors so flips are strided copies and ColorJitter
+        # runs vectorized tensor kernels instead of the PIL round-trip
+        img_tensor = torch.from_numpy(np.ascontiguousarray(image)).permute(2, 0, 1)
+        mask_tensor = torch.from_numpy(np.ascontiguousarray(mask)).permute(2, 0, 1)
 
         # 1. Image and Mask:
         # 1A. VerticalFlip
         if random.random() > 0.2:
-            pil_image = TF.vflip(pil_image)
-            pil_mask  = TF.vflip(pil_mask)
-        
+            img_tensor = TF.vflip(img_tensor)
+            mask_tensor = TF.vflip(mask_tensor)
+
         # 1B. Horitonal Flifp
         if random.random() > 0.2:
-            pil_image = TF.hflip(pil_image)
-            pil_mask  = TF.hflip(pil_mask)
+            img_tensor = TF.hflip(img_tensor)
+            mask_tensor = TF.hflip(mask_tensor)
 
         # 2. Image Only
-        transform_img = RandomChoice([
-                    T.ColorJitter(brightness=0.5, contrast=0.5, saturation=0.5, hue=0.5)
-                ])
-
-        pil_image, = transform_img([pil_image,])
+        # Tensor ColorJitter only accepts 1 or 3 channels, so for RGBA input
+        # (plt.imread on alpha PNGs) jitter the RGB planes and carry alpha through
+        if img_tensor.shape[0] == 4:
+            img_tensor = torch.cat((self._color_jitter(img_tensor[:3]), img_tensor[3:]), dim=0)
+        else:
+            img_tensor = self._color_jitter(img_tensor)
 
-        img = np.asarray(pil_image)/255
-        msk = np.asarray(pil_mask)/255
+        img = img_tensor.permute(1, 2, 0).numpy()
+        msk = mask_tensor.permute(1, 2, 0).numpy()
 
         return img, msk
 
-    def preprocessor_images(self, image, b_threshold=128):
+    def preprocessor_images(self, image, b_threshold=128, return_tensor=False):
         """
         Function to combine preprocessing steps to feed into ImageDataGenerator.
         'Masks' have to binarize then rescale. 'Images' just have to rescale.
@@ -279,16 +362,27 @@ class ImageProcessor:
         Parameters:
         image: image in numpy (x,y,3)
         b_threshold: binary threshold value for pixels, default at 128.
+        return_tensor: set True to get a contiguous CHW float32 torch tensor
+                ready for collation, skipping a later numpy round-trip.
 
         Return:
-        final_img: final image to return from preprocessor after going through 
+        final_img: final image to return from preprocessor after going through
                 all processing steps.
         """
+        if torch.is_tensor(image):
+            # Stay on the tensor's device; float tensors are already 0-1
+            if image.is_floating_point():
+                return image
+            return self.rescale_t(image)
+
         final_img = self.rescale(image)
 
+        if return_tensor:
+            return torch.from_numpy(np.ascontiguousarray(final_img)).permute(2, 0, 1).contiguous().float()
+
         return final_img
 
-    def preprocessor_masks(self, image, b_threshold=128, class_map=None):
+    def preprocessor_masks(self, image, b_threshold=128, class_map=None, return_tensor=False):
         """
         Function to combine preprocessing steps to feed into ImageDataGenerator.
         'Masks' have to binarize then rescale. 'Images' just have to rescale.
@@ -297,22 +391,227 @@ class ImageProcessor:
         image: image in numpy (x,y,3)
         class_map: mapping dataframe of classes and their corresponding RGB values for one hot encoding into separate channels
         b_threshold: binary threshold value for pixels, default at 128.
+        return_tensor: set True to get a CHW float32 torch tensor directly,
+                skipping a later numpy round-trip.
 
         Return:
-        final_img: final image to return from preprocessor after going through 
-                all processing steps.
+        final_img: final one hot encoded mask, channels first (num classes, H, W),
+                ready for torch.from_numpy with no permute.
         """
+        if torch.is_tensor(image):
+            return self._preprocessor_masks_t(image, class_map)
+
         image = self.mask_max_pixel_normalize(image)
-        image = self.one_hot_encode(image, class_map)
-        final_img = self.rescale(image)
+
+        # Quantize to uint8 once so the encode stays integer end-to-end; the
+        # 0/1 one-hot output needs no rescale pass, the DataLoader's single
+        # .float() cast on the tensor is the only float conversion left
+        if image.dtype != np.uint8:
+            image = np.rint(np.multiply(image, 255.)).astype(np.uint8)
+        final_img = self.one_hot_encode(image, class_map)
+
+        if return_tensor:
+            # Already contiguous channels first, so this is a zero-copy wrap
+            # followed by the pipeline's single float cast
+            return torch.from_numpy(final_img).float()
 
         return final_img
 
-class RandomChoice(torch.nn.Module):
-    def __init__(self, transforms):
-       super().__init__()
-       self.transforms = transforms
+    def _preprocessor_masks_t(self, image, class_map=None):
+        """
+        Tensor version of preprocessor_masks for channels-first (3, H, W)
+        torch.Tensor masks, running entirely on the tensor's device with
+        no host round-trip.
+
+        Parameters:
+        image: mask as a torch.Tensor (3, H, W)
+        class_map: mapping dataframe of classes and their corresponding RGB values for one hot encoding into separate channels
+
+        Return:
+        final_img: one hot encoded uint8 mask tensor (num classes, H, W)
+        """
+        if class_map is None:
+            palette = self._default_colors
+        else:
+            palette = class_map[['r', 'g', 'b']].values.astype(np.uint8)
+
+        colors = torch.as_tensor(palette, device=image.device)
+
+        # Training runs at one fixed resolution, so specialize the encode to
+        # this exact (shape, dtype, device) once and reuse it. The torch in
+        # requirements.txt predates torch.compile and stays eager.
+        key = (tuple(image.shape), image.dtype, image.device.type)
+        encode = self._mask_encode_compiled.get(key)
+        if encode is None:
+            encode = self._mask_encode_t
+            if hasattr(torch, 'compile'):
+                encode = torch.compile(encode, dynamic=False)
+            self._mask_encode_compiled[key] = encode
+
+        return encode(image, colors)
+
+    @staticmethod
+    def _mask_encode_t(image, colors):
+        """
+        Normalize-quantize-encode body of _preprocessor_masks_t, kept as a
+        pure tensor function so torch.compile can capture it in one graph.
+
+        Parameters:
+        image: mask as a torch.Tensor (3, H, W)
+        colors: palette as a uint8 torch.Tensor (num classes, 3)
+
+        Return:
+        one hot encoded uint8 mask tensor (num classes, H, W)
+        """
+        # Per-channel max normalize, same as mask_max_pixel_normalize
+        max_channel_values = image.amax(dim=(-2, -1), keepdim=True)
+        normalized = torch.where(image > (max_channel_values*0.8), torch.ones_like(image), image)
+
+        # Quantize once, then compare each pixel against the palette
+        if normalized.is_floating_point():
+            normalized = torch.round(normalized*255.).to(torch.uint8)
+        frame = (normalized.movedim(-3, -1)[..., None, :] == colors).all(dim=-1)
+
+        return frame.movedim(-1, -3).to(torch.uint8)
+
+    def _to_aosoa(self, img, tile=8):
+        """
+        Re-layout (..., H, W, 3) pixel data into AoSoA tiles
+        (..., H, W//tile, 3, tile): channels are split within each
+        tile-wide pixel group, so per-channel compares run on contiguous
+        tile-wide vectors while neighboring pixels stay within the same
+        cache lines. W is edge-padded up to a multiple of tile.
+
+        Parameters:
+        img: image in numpy (..., H, W, 3)
+        tile: pixels per tile, default 8 (one 64-bit lane of uint8)
+
+        Return:
+        tiled: contiguous AoSoA array (..., H, padded W//tile, 3, tile)
+        """
+        width = img.shape[-2]
+        pad = (-width) % tile
+        if pad:
+            pad_width = [(0, 0)]*(img.ndim - 2) + [(0, pad), (0, 0)]
+            img = np.pad(img, pad_width, mode='edge')
+
+        tiled = img.reshape(img.shape[:-2] + ((width + pad)//tile, tile, img.shape[-1]))
+
+        return np.ascontiguousarray(tiled.swapaxes(-2, -1))
+
+    def _from_aosoa(self, tiled, width):
+        """
+        Invert _to_aosoa: (..., H, W//tile, C, tile) back to channel-last
+        (..., H, W, C), dropping any tile padding beyond width.
+
+        Parameters:
+        tiled: AoSoA array from _to_aosoa
+        width: original (unpadded) image width
+
+        Return:
+        img: contiguous channel-last array (..., H, width, C)
+        """
+        img = tiled.swapaxes(-2, -1)
+        img = img.reshape(img.shape[:-3] + (img.shape[-3]*img.shape[-2], img.shape[-1]))
+
+        return np.ascontiguousarray(img[..., :width, :])
+
+    def one_hot_encode_tiled(self, img, class_map=None, tile=8):
+        """
+        one_hot_encode over AoSoA tiles: each class compare touches one
+        channel's tile-wide vector at a time (tile aligned 8-bit lanes)
+        instead of striding across interleaved RGB bytes. Used by the
+        batched mask preprocessor; output matches one_hot_encode.
+
+        Parameters:
+            img: mask image(s) in numpy (..., H, W, 3)
+            class_map: class_df
+            tile: pixels per tile, default 8
+
+        Return:
+            frame: one hot encoded mask(s), channels first (..., num classes, H, W)
+        """
+        if class_map is None:
+            palette = self._default_colors
+        else:
+            palette = class_map[['r', 'g', 'b']].values.astype(np.uint8)
+
+        if img.dtype != np.uint8:
+            img = np.rint(np.multiply(img, 255.)).astype(np.uint8)
+
+        width = img.shape[-2]
+        tiled = self._to_aosoa(img, tile)
+
+        # (..., H, W//tile, 1, 3, tile) vs (num classes, 3, 1): per-channel
+        # compares over whole tiles, reduced over the channel axis
+        match = np.all(tiled[..., None, :, :] == palette[:, :, None], axis=-2)
+
+        # (..., H, W//tile, num classes, tile) -> channels-first (..., num classes, H, W)
+        frame = np.moveaxis(match, -2, -4)
+        frame = frame.reshape(frame.shape[:-2] + (frame.shape[-2]*frame.shape[-1],))
+
+        return np.ascontiguousarray(frame[..., :width]).astype(np.uint8)
+
+    def rescale_batch(self, images, out=None):
+        """
+        Batched version of rescale for a stack of images in numpy (N,x,y,3).
+
+        Parameters:
+        images: batch of images in numpy (N,x,y,3)
+        out: optional preallocated float32 output buffer of the same shape
+
+        Return:
+        out: batch of rescaled images in numpy matrix
+        """
+        if out is None:
+            out = np.empty(images.shape, dtype=np.float32)
+
+        if np.max(images) > 1:
+            np.multiply(images, 1./255, out=out)
+        else:
+            np.copyto(out, images)
+
+        return out
+
+    def preprocessor_images_batch(self, images, b_threshold=128):
+        """
+        Batched version of preprocessor_images for a stack of images in numpy (N,x,y,3).
+        Runs the rescale over the whole batch in one NumPy pass instead of
+        once per sample.
+
+        Parameters:
+        images: batch of images in numpy (N,x,y,3)
+        b_threshold: binary threshold value for pixels, default at 128.
+
+        Return:
+        final_imgs: batch of processed images
+        """
+        final_imgs = self.rescale_batch(images)
+
+        return final_imgs
+
+    def preprocessor_masks_batch(self, images, b_threshold=128, class_map=None):
+        """
+        Batched version of preprocessor_masks for a stack of masks in numpy (N,x,y,3).
+        Normalizes per-image channel maxima and one hot encodes the whole
+        batch in single broadcast passes instead of once per sample.
+
+        Parameters:
+        images: batch of mask images in numpy (N,x,y,3)
+        class_map: mapping dataframe of classes and their corresponding RGB values for one hot encoding into separate channels
+        b_threshold: binary threshold value for pixels, default at 128.
+
+        Return:
+        final_imgs: batch of processed one hot encoded masks
+        """
+        # Per-image, per-channel maxima, shape (N,1,1,3)
+        max_channel_values = images.max(axis=(1, 2), keepdims=True)
+        normalized = np.where(images > (max_channel_values*0.8), images.dtype.type(1.), images)
+
+        # Same uint8 quantization as the per-sample path, then one tiled
+        # encode over the whole batch
+        if normalized.dtype != np.uint8:
+            normalized = np.rint(np.multiply(normalized, 255.)).astype(np.uint8)
+        final_imgs = self.one_hot_encode_tiled(normalized, class_map)
 
-    def __call__(self, imgs):
-        t = random.choice(self.transforms)
-        return [t(img) for img in imgs]
\ No newline at end of file
+        return final_imgs
\ No newline at end of file
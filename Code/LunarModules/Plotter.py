@@ -13,7 +13,6 @@ import seaborn as sns
 import os
 import random
 import cv2
-import copy
 import time
 import torch
 random.seed(time.perf_counter())
@@ -374,10 +373,10 @@ class Plotter:
         elif imsize is not None and sample_masks is None:
             image =  cv2.resize(image, (imsize, imsize))
 
-        image1 = copy.deepcopy(image)
+        image1 = image.copy()
 
         if model_alt:
-            image2 = copy.deepcopy(image)
+            image2 = image.copy()
             if imsize_alt is not None and sample_masks is not None:
                 image2 =  cv2.resize(image, (imsize_alt, imsize_alt))
                 mask =  cv2.resize(mask, (imsize_alt, imsize_alt))
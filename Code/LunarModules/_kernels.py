@@ -0,0 +1,115 @@
+"""
+_kernels.py
+Numba-compiled pixel kernels for the ImageProcessor hot paths.
+
+Each kernel fuses the multiple NumPy passes of its ImageProcessor
+counterpart into one loop nest and multithreads it with prange over
+rows. Numba is optional: when it is not installed, NUMBA_AVAILABLE is
+False and ImageProcessor keeps its vectorized NumPy implementations.
+
+author: @saharae, @justjoshtings
+created: 12/04/2022
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        # No-op stand-in so the kernels below still define plain functions
+        if args and callable(args[0]):
+            return args[0]
+        def wrapper(func):
+            return func
+        return wrapper
+
+
+@njit(parallel=True, fastmath=True, cache=True, nogil=True)
+def binarize_kernel(img, thr, out):
+    """
+    Fused binarize: out[y,x,c] = 255 where img > thr else 0.
+
+    Parameters:
+    img: image in numpy (x,y,channels)
+    thr: pixel threshold, already scaled to the image's value range
+    out: preallocated float32 output of the same shape
+    """
+    H, W, C = img.shape
+    for y in prange(H):
+        for x in range(W):
+            for c in range(C):
+                if img[y, x, c] > thr:
+                    out[y, x, c] = 255.
+                else:
+                    out[y, x, c] = 0.
+
+
+@njit(parallel=True, fastmath=True, cache=True, nogil=True)
+def rescale_kernel(img, out):
+    """
+    Fused rescale from 0-255 to 0-1 into a preallocated float32 output.
+
+    Parameters:
+    img: image in numpy (x,y,channels) with 0-255 values
+    out: preallocated float32 output of the same shape
+    """
+    H, W, C = img.shape
+    for y in prange(H):
+        for x in range(W):
+            for c in range(C):
+                out[y, x, c] = img[y, x, c]*(1./255)
+
+
+@njit(parallel=True, fastmath=True, cache=True, nogil=True)
+def mask_max_pixel_normalize_kernel(img, threshold, out):
+    """
+    Fused max-pixel normalize: per-channel max reduction plus thresholded
+    write in one compiled pass.
+
+    Parameters:
+    img: mask image in numpy (x,y,3)
+    threshold: threshold multiplier on the per-channel max
+    out: preallocated output of the same shape and dtype
+    """
+    H, W, C = img.shape
+    for c in range(C):
+        max_value = img[0, 0, c]
+        for y in range(H):
+            for x in range(W):
+                if img[y, x, c] > max_value:
+                    max_value = img[y, x, c]
+        cutoff = max_value*threshold
+        for y in prange(H):
+            for x in range(W):
+                if img[y, x, c] > cutoff:
+                    out[y, x, c] = 1.
+                else:
+                    out[y, x, c] = img[y, x, c]
+
+
+@njit(parallel=True, fastmath=True, cache=True, nogil=True)
+def one_hot_encode_kernel(img, colors, out):
+    """
+    Fused one hot encode: compare each pixel's RGB against every class
+    color in one pass.
+
+    Parameters:
+    img: mask image in numpy (x,y,3)
+    colors: class palette in numpy (num classes,3), same dtype/scale as img
+    out: preallocated channel-major (num classes,x,y) output
+    """
+    H, W = img.shape[0], img.shape[1]
+    num_classes = colors.shape[0]
+    for y in prange(H):
+        for x in range(W):
+            for c in range(num_classes):
+                if (img[y, x, 0] == colors[c, 0]
+                        and img[y, x, 1] == colors[c, 1]
+                        and img[y, x, 2] == colors[c, 2]):
+                    out[c, y, x] = 1
+                else:
+                    out[c, y, x] = 0
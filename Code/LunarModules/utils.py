@@ -231,16 +231,13 @@ def single_real_test(test_data_loader, device, DATA_PATH):
             mask_loaded = plt.imread(data_path + '/real_mask/g_' + img)
             mask_loaded = cv2.resize(mask_loaded, (256, 256))
 
-            img_loaded = img_mask_processor.preprocessor_images(img_loaded)
-            mask_loaded = img_mask_processor.preprocessor_masks(mask_loaded)
+            # Preprocessors hand back CHW float32 tensors, no reorder needed
+            img_tensor = img_mask_processor.preprocessor_images(img_loaded, return_tensor=True)
+            mask_tensor = img_mask_processor.preprocessor_masks(mask_loaded, return_tensor=True)
 
-            img_tensor = torch.from_numpy(img_loaded).float()
-            mask_tensor = torch.from_numpy(mask_loaded).float()
-
-            # Change ordering, channels first then img size
-            x_test = img_tensor.permute(2, 0, 1).to(device)
+            x_test = img_tensor.to(device)
             x_test = torch.unsqueeze(x_test, 0)
-            y_test = mask_tensor.permute(2, 0, 1).to(device)
+            y_test = mask_tensor.to(device)
             y_test = torch.unsqueeze(y_test, 0)
 
             if x_test.shape[1] == 4:
@@ -317,16 +314,13 @@ def get_real_stats(test_data_loader, device, DATA_PATH):
             mask_loaded = plt.imread(data_path + '/real_mask/g_' + img)
             mask_loaded = cv2.resize(mask_loaded, (256, 256))
 
-            img_loaded = img_mask_processor.preprocessor_images(img_loaded)
-            mask_loaded = img_mask_processor.preprocessor_masks(mask_loaded)
-
-            img_tensor = torch.from_numpy(img_loaded).float()
-            mask_tensor = torch.from_numpy(mask_loaded).float()
+            # Preprocessors hand back CHW float32 tensors, no reorder needed
+            img_tensor = img_mask_processor.preprocessor_images(img_loaded, return_tensor=True)
+            mask_tensor = img_mask_processor.preprocessor_masks(mask_loaded, return_tensor=True)
 
-            # Change ordering, channels first then img size
-            x_test = img_tensor.permute(2, 0, 1).to(device)
+            x_test = img_tensor.to(device)
             x_test = torch.unsqueeze(x_test, 0)
-            y_test = mask_tensor.permute(2, 0, 1).to(device)
+            y_test = mask_tensor.to(device)
             y_test = torch.unsqueeze(y_test, 0)
 
             if x_test.shape[1] == 4:
@@ -20,12 +20,21 @@ cd ./Final-Project-Group5
 pip3 install -r requirements.txt
 pip3 install kaggle
 
+# Rebuild Pillow-SIMD with AVX2 kernels for faster image transforms
+# (falls back to the SSE4 wheel if the compiler flag is unsupported)
+pip3 uninstall -y pillow
+CC="cc -mavx2" pip3 install --upgrade --force-reinstall pillow-simd==9.0.0.post1
+
 # Make Log File
 mkdir ./Lunar_Log/
 cd ./Lunar_Log/
 touch lunar.log
 cd ../Code/
 
+# Build the optional AVX2 one hot encode extension
+# (ImageProcessor falls back to NumPy if this fails or is skipped)
+python3 setup_ohe_simd.py build_ext --inplace || echo "AVX2 extension build failed, using NumPy fallback"
+
 # Set up Kaggle API
 echo "Setup Kaggle API and download kaggle.json"
 
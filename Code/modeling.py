@@ -76,19 +76,26 @@ def RUN_MODEL_LOOP(TRAIN = True, debug = False, plot = True, data_source = 'grou
     num_classes = 4
     all_models = []
 
+    # Preprocess in parallel worker processes that prefetch batches while the
+    # GPU trains; workers persist across epochs to avoid respawn overhead
+    num_workers = (os.cpu_count() or 2) // 2
+    loader_kwargs = dict(num_workers = num_workers, pin_memory = True)
+    if num_workers > 0:
+        loader_kwargs.update(persistent_workers = True, prefetch_factor = 4)
+
 
     # ----------------------------- GET DATA
     train_data = CustomDataLoader(img_folder=train_img_folder, mask_folder=train_mask_folder, batch_size=batch_size, imsize=imsize, num_classes=num_classes, split='train', augmentation=True)
-    train_data_loader = DataLoader(train_data, batch_size=batch_size, shuffle=True)
+    train_data_loader = DataLoader(train_data, batch_size=batch_size, shuffle=True, **loader_kwargs)
 
     val_data = CustomDataLoader(img_folder=val_img_folder, mask_folder=val_mask_folder, batch_size=batch_size, imsize=imsize, num_classes=num_classes, split='validation', augmentation=False)
-    val_data_loader = DataLoader(val_data, batch_size=batch_size, shuffle=True)
+    val_data_loader = DataLoader(val_data, batch_size=batch_size, shuffle=True, **loader_kwargs)
 
     test_data = CustomDataLoader(img_folder=test_img_folder, mask_folder=test_mask_folder, batch_size=batch_size, imsize=imsize, num_classes=num_classes, split='test', augmentation=False)
-    test_data_loader = DataLoader(test_data, batch_size=batch_size, shuffle=True)
+    test_data_loader = DataLoader(test_data, batch_size=batch_size, shuffle=True, **loader_kwargs)
 
     real_test_data = CustomDataLoader(img_folder=real_test_img_folder, mask_folder=real_test_mask_folder, batch_size=batch_size, imsize=imsize, num_classes=num_classes, split='test', augmentation=False)
-    real_test_data_loader = DataLoader(real_test_data, batch_size=batch_size, shuffle=True)
+    real_test_data_loader = DataLoader(real_test_data, batch_size=batch_size, shuffle=True, **loader_kwargs)
 
 
     # ----------------------------- DEBUGGING
@@ -0,0 +1,25 @@
+"""
+setup_ohe_simd.py
+Builds the optional _ohe_simd AVX2 one hot encode extension in place.
+
+Usage (from the Code directory):
+    python3 setup_ohe_simd.py build_ext --inplace
+
+If the build fails (no compiler, non-x86 host), skip it: ImageProcessor
+falls back to the NumPy broadcast compare automatically.
+
+author: @saharae, @justjoshtings
+created: 12/04/2022
+"""
+from setuptools import setup, Extension
+
+setup(
+    name='ohe-simd',
+    ext_modules=[
+        Extension(
+            'LunarModules._ohe_simd',
+            sources=['LunarModules/_ohe_simd.c'],
+            extra_compile_args=['-O3', '-mavx2'],
+        )
+    ],
+)